@@ -2,27 +2,71 @@
 
 This module contains reusable logic for:
 - email normalization and validation
-- password hashing/verification
+- password hashing/verification (with an optional verified-login cache)
 - session token generation and token hashing
-- active session lookup
+- active session lookup (with or without the owning user)
 """
 
 import hashlib
 import hmac
 import re
 import secrets
-from datetime import UTC, datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
 
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.clock import now_utc
 from app.database import Session, User
 from app.settings import get_settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=get_settings().bcrypt_rounds,
+    bcrypt__ident="2b",
+)
 EMAIL_PATTERN = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
 
+# Active-session lookups are built once so requests skip statement construction;
+# per-request values are supplied by name through bindparams.
+_ACTIVE_SESSION_FILTERS = (
+    Session.session_token_hash.in_([bindparam("token_hash"), bindparam("legacy_token_hash")]),
+    Session.revoked_at.is_(None),
+    Session.expires_at > bindparam("now"),
+)
+_ACTIVE_SESSION_WITH_USER_STMT = (
+    select(Session, User).join(User, User.id == Session.user_id).where(*_ACTIVE_SESSION_FILTERS)
+)
+_ACTIVE_SESSION_STMT = select(Session).where(*_ACTIVE_SESSION_FILTERS)
+
+# Opt-in LRU of successful (password_hash, keyed password digest) checks.
+_verify_cache: OrderedDict[tuple[str, bytes], None] = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+
+@lru_cache
+def _app_secret_bytes() -> bytes:
+    """Encode APP_SECRET once per process."""
+    return get_settings().app_secret.encode("utf-8")
+
+
+@lru_cache
+def _session_key() -> bytes:
+    """Derive the 32-byte BLAKE2b session-token key once per process."""
+    return hashlib.sha256(_app_secret_bytes()).digest()
+
+
+@lru_cache
+def _session_ttl() -> timedelta:
+    """Build the configured session lifetime once per process."""
+    return timedelta(hours=get_settings().session_ttl_hours)
+
 
 def normalize_email(email: str) -> str:
     """Trim spaces around user-provided email input."""
@@ -40,8 +84,40 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    """Verify plain password against a stored hash."""
-    return pwd_context.verify(password, password_hash)
+    """Verify plain password against a stored hash.
+
+    When PASSWORD_VERIFY_CACHE_SIZE is set, successful checks are remembered so
+    repeat logins skip bcrypt. Failures are never cached, and entries are keyed
+    by the stored hash, so a password change never matches an old entry.
+    """
+    cache_size = get_settings().password_verify_cache_size
+    if cache_size <= 0:
+        return pwd_context.verify(password, password_hash)
+
+    # Keyed digest so cached entries are not a fast offline guessing oracle.
+    key = (password_hash, hmac.digest(_app_secret_bytes(), password.encode("utf-8"), "sha256"))
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            _verify_cache.move_to_end(key)
+            return True
+
+    if not pwd_context.verify(password, password_hash):
+        return False
+
+    with _verify_cache_lock:
+        _verify_cache[key] = None
+        while len(_verify_cache) > cache_size:
+            _verify_cache.popitem(last=False)
+    return True
+
+
+def measure_password_verify_ms() -> float:
+    """Time one bcrypt verification at the configured cost factor."""
+    probe = secrets.token_urlsafe(16)
+    probe_hash = pwd_context.hash(probe)
+    started = time.perf_counter()
+    pwd_context.verify(probe, probe_hash)
+    return (time.perf_counter() - started) * 1000
 
 
 def generate_session_token() -> str:
@@ -51,31 +127,49 @@ def generate_session_token() -> str:
 
 def hash_session_token(token: str) -> str:
     """Hash session token for storage so raw token is never persisted."""
-    app_secret = get_settings().app_secret.encode("utf-8")
-    return hmac.new(app_secret, token.encode("utf-8"), hashlib.sha256).hexdigest()
+    # BLAKE2b keyed mode is a single pass, unlike HMAC's inner/outer hashes.
+    return hashlib.blake2b(token.encode("utf-8"), key=_session_key(), digest_size=32).hexdigest()
+
+
+def _legacy_hash_session_token(token: str) -> str:
+    """HMAC-SHA256 token hash written before the BLAKE2b switch.
+
+    Still accepted on lookup so existing logins survive the rollout, at the cost
+    of a second digest per authenticated request. The switch shipped 2026-10-15:
+    once SESSION_TTL_HOURS has passed since that deploy, set
+    ACCEPT_LEGACY_SESSION_HASH=false, then delete this function and the setting.
+    """
+    return hmac.new(_app_secret_bytes(), token.encode("utf-8"), hashlib.sha256).hexdigest()
 
 
 def session_expiry() -> datetime:
     """Compute session expiration timestamp from configured TTL."""
-    ttl = get_settings().session_ttl_hours
-    return datetime.now(UTC) + timedelta(hours=ttl)
+    return now_utc() + _session_ttl()
+
+
+def _active_session_params(token: str) -> dict[str, str | datetime]:
+    """Bind values for the prebuilt active-session statements."""
+    token_hash = hash_session_token(token)
+    if get_settings().accept_legacy_session_hash:
+        legacy_token_hash = _legacy_hash_session_token(token)
+    else:
+        # Same statement shape; binding the new digest twice skips the HMAC.
+        legacy_token_hash = token_hash
+    return {"token_hash": token_hash, "legacy_token_hash": legacy_token_hash, "now": now_utc()}
 
 
 async def get_active_session(
     db: AsyncSession, token: str
 ) -> tuple[Session, User] | tuple[None, None]:
     """Return active non-revoked, non-expired session and related user."""
-    token_hash = hash_session_token(token)
-    now = datetime.now(UTC)
-
-    result = await db.execute(
-        select(Session, User)
-        .join(User, User.id == Session.user_id)
-        .where(Session.session_token_hash == token_hash)
-        .where(Session.revoked_at.is_(None))
-        .where(Session.expires_at > now)
-    )
+    result = await db.execute(_ACTIVE_SESSION_WITH_USER_STMT, _active_session_params(token))
     row = result.first()
     if not row:
         return None, None
     return row[0], row[1]
+
+
+async def get_active_session_only(db: AsyncSession, token: str) -> Session | None:
+    """Return active non-revoked, non-expired session without joining its user."""
+    result = await db.execute(_ACTIVE_SESSION_STMT, _active_session_params(token))
+    return result.scalar_one_or_none()
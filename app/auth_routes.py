@@ -7,16 +7,18 @@ Routes in this file implement basic account and session flows:
 - who-am-I (`/auth/me`)
 """
 
+import asyncio
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import (
     generate_session_token,
     get_active_session,
+    get_active_session_only,
     hash_password,
     hash_session_token,
     normalize_email,
@@ -73,19 +75,19 @@ async def get_current_user(
     return user
 
 
-async def get_current_session_token_hash(
+async def get_current_session(
     request: Request,
     db: AsyncSession = Depends(get_session),
-) -> str:
-    """Resolve active session and return its hashed token ID."""
+) -> Session:
+    """Resolve the active session row without loading its user."""
     token = _read_token(request)
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    active_session, _ = await get_active_session(db, token)
+    active_session = await get_active_session_only(db, token)
     if not active_session:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
-    return active_session.session_token_hash
+    return active_session
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -116,17 +118,27 @@ async def login_user(
     email = normalize_email(credentials.email)
     result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    # Copy fields out before rollback expires the instance. Ending the read
+    # transaction returns the connection to the pool for the duration of bcrypt.
+    user_id, user_email, password_hash = user.id, user.email, user.password_hash
+    await db.rollback()
+    # bcrypt is deliberately slow; run it in a worker thread so the event loop
+    # keeps serving other requests' DB round-trips meanwhile.
+    if not await asyncio.to_thread(verify_password, credentials.password, password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     token = generate_session_token()
-    token_hash = hash_session_token(token)
-    new_session = Session(
-        user_id=user.id,
-        session_token_hash=token_hash,
-        expires_at=session_expiry(),
+    # Core insert: the cookie token is all we return, so skip ORM instance tracking.
+    await db.execute(
+        insert(Session).values(
+            user_id=user_id,
+            session_token_hash=hash_session_token(token),
+            expires_at=session_expiry(),
+        )
     )
-    db.add(new_session)
     await db.commit()
 
     settings = get_settings()
@@ -138,20 +150,18 @@ async def login_user(
         secure=False,
         samesite="lax",
     )
-    return UserResponse(id=user.id, email=user.email)
+    return UserResponse(id=user_id, email=user_email)
 
 
 @router.post("/logout")
 async def logout_user(
     response: Response,
-    token_hash: str = Depends(get_current_session_token_hash),
+    active_session: Session = Depends(get_current_session),
     db: AsyncSession = Depends(get_session),
 ) -> dict[str, str]:
     """Revoke active session and clear auth cookie."""
-    result = await db.execute(select(Session).where(Session.session_token_hash == token_hash))
-    session = result.scalar_one_or_none()
-    if session:
-        session.revoked_at = datetime.now(UTC)
+    # Same request-scoped DB session as the dependency, so no re-select is needed.
+    active_session.revoked_at = datetime.now(UTC)
     await db.commit()
     response.delete_cookie(SESSION_COOKIE_NAME)
     return {"status": "logged_out"}
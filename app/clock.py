@@ -0,0 +1,30 @@
+"""Coarse UTC clock for hot request paths.
+
+A background task refreshes one cached timestamp every few milliseconds so
+session checks read a module global instead of building a new `datetime` per
+request. ORM column defaults keep using `datetime.now(UTC)` directly.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+REFRESH_INTERVAL_SECONDS = 0.05
+
+_now: datetime | None = None
+
+
+async def clock_loop() -> None:
+    """Refresh the cached timestamp until the task is cancelled."""
+    global _now
+    try:
+        while True:
+            _now = datetime.now(UTC)
+            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+    finally:
+        # Never serve a frozen timestamp once the loop stops.
+        _now = None
+
+
+def now_utc() -> datetime:
+    """Return the cached UTC time, or a live reading when the loop is not running."""
+    return _now if _now is not None else datetime.now(UTC)
@@ -2,18 +2,20 @@
 
 This module defines all persistent tables and provides shared helpers:
 - `init_db` to create tables at startup
+- `monitor_database` to keep readiness status fresh in the background
 - `get_session` to inject SQLAlchemy async sessions into routes
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 from datetime import UTC, datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text
+from sqlalchemy import Connection, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.pool import NullPool
 
 from app import logger
 from app.settings import get_settings
@@ -78,12 +80,13 @@ class Patient(Base):
     __tablename__ = "patients"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Indexed through idx_patients_owner_id, which leads with this column.
     owner_user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     ciphertext: Mapped[str] = mapped_column(Text, nullable=False)
-    iv: Mapped[str] = mapped_column(String(255), nullable=False)
-    tag: Mapped[str] = mapped_column(String(255), nullable=False)
+    iv: Mapped[bytes] = mapped_column(LargeBinary(12), nullable=False)
+    tag: Mapped[bytes] = mapped_column(LargeBinary(16), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False
     )
@@ -103,16 +106,32 @@ class SearchToken(Base):
     patient_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False, index=True
     )
-    token: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    token: Mapped[str] = mapped_column(String(128), nullable=False)
 
     patient: Mapped[Patient] = relationship(back_populates="tokens")
 
 
-Index("idx_search_tokens_token", SearchToken.token)
+# Lets token lookups return patient_id straight from the index (index-only scan).
+Index("idx_search_tokens_token_patient", SearchToken.token, SearchToken.patient_id)
+Index("idx_patients_owner_id", Patient.owner_user_id, Patient.id)
 Index("idx_sessions_user_expires", Session.user_id, Session.expires_at)
 
 settings = get_settings()
-engine = create_async_engine(settings.database_url, echo=False, pool_pre_ping=True)
+engine = create_async_engine(
+    settings.database_url,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    connect_args={
+        # Per-connection cache of asyncpg prepared statements (SQLAlchemy default is 100).
+        "prepared_statement_cache_size": 1024,
+        # Short OLTP queries only; JIT compilation adds latency without paying off.
+        "server_settings": {"jit": "off"},
+    },
+)
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 _db_ready = False
@@ -140,12 +159,47 @@ def get_database_status() -> tuple[bool, str | None]:
     return _db_ready, _db_error
 
 
+# Single-column indexes made redundant by composites with the same leading column
+# (idx_search_tokens_token_patient, idx_patients_owner_id).
+_OBSOLETE_INDEXES = (
+    "ix_search_tokens_token",
+    "idx_search_tokens_token",
+    "ix_patients_owner_user_id",
+)
+
+
+def _upgrade_schema(conn: Connection) -> None:
+    """Apply in-place changes that `create_all` cannot make to existing tables."""
+    columns = {column["name"]: column["type"] for column in inspect(conn).get_columns("patients")}
+    for name in ("iv", "tag"):
+        # Older rows stored IV/tag as urlsafe base64 text; convert them to raw bytes.
+        if not isinstance(columns[name], LargeBinary):
+            conn.execute(
+                text(
+                    f"ALTER TABLE patients ALTER COLUMN {name} TYPE BYTEA "
+                    f"USING decode(translate({name}, '-_', '+/'), 'base64')"
+                )
+            )
+            logger.info("Converted patients.%s to BYTEA", name)
+
+    for index_name in _OBSOLETE_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+    # create_all only builds indexes alongside new tables; add any that are missing.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db() -> None:
     """Create tables and indexes if they do not already exist."""
     global _db_ready, _db_error
+    # Schema setup uses its own unpooled engine so it never holds app pool slots.
+    init_engine = create_async_engine(settings.database_url, poolclass=NullPool)
     try:
-        async with engine.begin() as conn:
+        async with init_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_upgrade_schema)
         _db_ready = True
         _db_error = None
         logger.info("Database initialized")
@@ -153,24 +207,37 @@ async def init_db() -> None:
         _db_ready = False
         _db_error = _format_db_error(exc)
         logger.error(_db_error)
+    finally:
+        await init_engine.dispose()
+
+
+async def monitor_database(interval_seconds: float = 5.0) -> None:
+    """Periodically ping the database and update readiness status.
+
+    This replaces a per-request `SELECT 1`; stale pooled connections are already
+    validated on checkout by `pool_pre_ping`.
+    """
+    global _db_ready, _db_error
+    while True:
+        await asyncio.sleep(interval_seconds)
+        if not _db_ready:
+            # Retry full initialization so tables exist once the database is back.
+            await init_db()
+            continue
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            _db_ready = False
+            _db_error = _format_db_error(exc)
+            logger.error(_db_error)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Yield one async DB session per request."""
-    global _db_ready, _db_error
     if not _db_ready and _db_error:
+        # Fail fast with a friendly error while the database is unavailable.
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=_db_error)
 
     async with AsyncSessionLocal() as session:
-        try:
-            # Fail fast with a friendly error if DB becomes unavailable.
-            await session.execute(text("SELECT 1"))
-        except SQLAlchemyError as exc:
-            _db_ready = False
-            _db_error = _format_db_error(exc)
-            logger.error(_db_error)
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=_db_error,
-            ) from exc
         yield session
@@ -7,14 +7,21 @@ search tokens generated from trigrams.
 import base64
 import hashlib
 import hmac
+import os
 import secrets
-from typing import Optional
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, TypeVar
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from app import logger
 from app.settings import get_settings
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class EncryptionService:
     """Encapsulates encryption/decryption and token generation logic."""
@@ -25,31 +32,73 @@ class EncryptionService:
         self.aes_key = hashlib.sha256(settings.aes_key.encode("utf-8")).digest()
         self.hmac_key = hashlib.sha256(settings.hmac_key.encode("utf-8")).digest()
         self.aesgcm = AESGCM(self.aes_key)
+        # Keyed HMAC state prepared once; token generation copies it per value.
+        self._hmac_prototype = hmac.new(self.hmac_key, digestmod=hashlib.sha256)
+        # Trigram inputs come from a small fixed alphabet ([a-z0-9_]^3 is about 50k
+        # values), so a bounded cache can hold the whole working set.
+        self._cached_hmac_token = lru_cache(maxsize=65536)(self._compute_hmac_token)
+        # AES-GCM runs inside OpenSSL without the GIL, so batches fan out to cores.
+        self._workers = os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=self._workers)
 
-    def encrypt_data(self, plaintext: str) -> tuple[str, str, str]:
-        """Encrypt plaintext and return base64 ciphertext, iv, and tag."""
+    def encrypt_data(self, plaintext: str | bytes) -> tuple[str, bytes, bytes]:
+        """Encrypt text or UTF-8 bytes and return base64 ciphertext plus raw iv and tag."""
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode("utf-8")
         iv = secrets.token_bytes(12)
-        encrypted = self.aesgcm.encrypt(iv, plaintext.encode("utf-8"), None)
+        encrypted = self.aesgcm.encrypt(iv, plaintext, None)
         ciphertext = encrypted[:-16]
         tag = encrypted[-16:]
-        return (
-            base64.urlsafe_b64encode(ciphertext).decode("utf-8"),
-            base64.urlsafe_b64encode(iv).decode("utf-8"),
-            base64.urlsafe_b64encode(tag).decode("utf-8"),
-        )
+        return base64.urlsafe_b64encode(ciphertext).decode("utf-8"), iv, tag
 
-    def decrypt_data(self, ciphertext: str, iv: str, tag: str) -> Optional[str]:
+    def decrypt_data(self, ciphertext: str, iv: bytes, tag: bytes) -> Optional[str]:
         """Decrypt previously encrypted payload; return None when invalid."""
         try:
             ct = base64.urlsafe_b64decode(ciphertext.encode("utf-8"))
-            iv_bytes = base64.urlsafe_b64decode(iv.encode("utf-8"))
-            tag_bytes = base64.urlsafe_b64decode(tag.encode("utf-8"))
-            decrypted = self.aesgcm.decrypt(iv_bytes, ct + tag_bytes, None)
+            decrypted = self.aesgcm.decrypt(iv, ct + tag, None)
             return decrypted.decode("utf-8")
         except Exception:
             logger.warning("Decryption failed")
             return None
 
-    def generate_hmac_token(self, value: str) -> str:
-        """Generate deterministic token for searchable indexing."""
-        return hmac.new(self.hmac_key, value.encode("utf-8"), hashlib.sha256).hexdigest()
+    def _map_chunked(self, func: Callable[[T], R], items: list[T]) -> list[R]:
+        """Apply `func` across the pool with one contiguous slice per worker.
+
+        Per-record payloads are small, so one pool task per record costs more
+        than the AES work itself; slicing amortizes that over each chunk.
+        """
+        chunk_size = max(1, -(-len(items) // self._workers))
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results: list[R] = []
+        for chunk_results in self._pool.map(lambda chunk: [func(item) for item in chunk], chunks):
+            results.extend(chunk_results)
+        return results
+
+    def encrypt_batch(self, plaintexts: list[str | bytes]) -> list[tuple[str, bytes, bytes]]:
+        """Encrypt many plaintexts in parallel, preserving input order."""
+        return self._map_chunked(self.encrypt_data, plaintexts)
+
+    def decrypt_batch(self, items: list[tuple[str, bytes, bytes]]) -> list[Optional[str]]:
+        """Decrypt many (ciphertext, iv, tag) payloads in parallel, preserving order."""
+        return self._map_chunked(lambda item: self.decrypt_data(*item), items)
+
+    def _compute_hmac_token(self, value: str | bytes) -> str:
+        """Compute one HMAC-SHA256 token from the cached keyed state."""
+        mac = self._hmac_prototype.copy()
+        mac.update(value.encode("utf-8") if isinstance(value, str) else value)
+        return mac.hexdigest()
+
+    def generate_hmac_token(self, value: str | bytes) -> str:
+        """Generate deterministic token for searchable indexing (text or UTF-8 bytes)."""
+        return self._cached_hmac_token(value)
+
+    def generate_hmac_tokens(self, values: Iterable[str | bytes]) -> list[str]:
+        """Generate search tokens for many values without redoing the HMAC key setup."""
+        cached_token = self._cached_hmac_token
+        return [cached_token(value) for value in values]
+
+
+@lru_cache(maxsize=1)
+def get_encryption_service() -> EncryptionService:
+    """Return the process-wide EncryptionService, building it on first use."""
+    return EncryptionService()
@@ -2,18 +2,24 @@
 
 Startup behavior:
 - read settings
-- initialize database tables
+- start the cached request clock
+- initialize database tables and start the background health monitor
+- log bcrypt verify latency so BCRYPT_ROUNDS can be tuned
 - register auth and patient routers
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app import logger
+from app.auth import measure_password_verify_ms
 from app.auth_routes import router as auth_router
-from app.database import get_database_status, init_db
+from app.clock import clock_loop
+from app.database import get_database_status, init_db, monitor_database
 from app.routes import router as patient_router
 from app.settings import get_settings
 
@@ -23,12 +29,24 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     """Initialize persistent storage before serving traffic."""
+    clock_task = asyncio.create_task(clock_loop())
     await init_db()
+    verify_ms = await asyncio.to_thread(measure_password_verify_ms)
+    logger.info(
+        "bcrypt verify takes %.0f ms at %d rounds", verify_ms, settings.bcrypt_rounds
+    )
+    monitor_task = asyncio.create_task(monitor_database())
     logger.info("Application startup complete")
     yield
+    monitor_task.cancel()
+    clock_task.cancel()
 
 
-app = FastAPI(title="Secure Bloom SSE", lifespan=lifespan)
+app = FastAPI(
+    title="Secure Bloom SSE",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -4,21 +4,46 @@ This file handles encrypted patient create/search/read operations and ensures
 all operations are scoped to the authenticated user.
 """
 
-import json
+import asyncio
+from collections.abc import AsyncIterator, Sequence
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import distinct, select
+from sqlalchemy import ARRAY, String, any_, bindparam, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth_routes import get_current_user
 from app.database import Patient, SearchToken, User, get_session
-from app.encryption import EncryptionService
-from app.utils import generate_trigrams
+from app.encryption import EncryptionService, get_encryption_service
+from app.utils import generate_query_trigrams, generate_trigrams
 
 router = APIRouter(prefix="/patients", tags=["patients"])
 
-encryption_service = EncryptionService()
+# Search results are decrypted and sent in slices of this many rows.
+SEARCH_STREAM_CHUNK_SIZE = 64
+
+# Single-record read, scoped to the owner so IDs cannot be probed across users.
+_PATIENT_BY_ID_STMT = (
+    select(Patient)
+    .where(Patient.id == bindparam("patient_id"))
+    .where(Patient.owner_user_id == bindparam("owner_user_id"))
+)
+# Semi-join on matching tokens (no DISTINCT over row payloads); tokens bind as a
+# single array parameter so the SQL text is identical for any number of trigrams.
+_SEARCH_STMT = (
+    select(Patient)
+    .where(Patient.owner_user_id == bindparam("owner_user_id"))
+    .where(
+        Patient.id.in_(
+            select(SearchToken.patient_id).where(
+                SearchToken.token == any_(bindparam("tokens", type_=ARRAY(String)))
+            )
+        )
+    )
+    .order_by(Patient.id.desc())
+)
 
 
 class PatientCreate(BaseModel):
@@ -38,14 +63,40 @@ class PatientResponse(BaseModel):
     diagnosis: str
 
 
+async def _stream_search_results(
+    patients: Sequence[Patient],
+    encryption_service: EncryptionService,
+) -> AsyncIterator[bytes]:
+    """Yield decrypted patients as one JSON array, a chunk of rows at a time."""
+    yield b"["
+    separator = b""
+    for start in range(0, len(patients), SEARCH_STREAM_CHUNK_SIZE):
+        chunk = patients[start : start + SEARCH_STREAM_CHUNK_SIZE]
+        # Wait for the pooled decrypts off the event loop so other requests keep running.
+        decrypted_rows = await asyncio.to_thread(
+            encryption_service.decrypt_batch,
+            [(patient.ciphertext, patient.iv, patient.tag) for patient in chunk],
+        )
+        rows = [
+            orjson.dumps({"id": patient.id, **orjson.loads(decrypted)})
+            for patient, decrypted in zip(chunk, decrypted_rows)
+            if decrypted
+        ]
+        if rows:
+            yield separator + b",".join(rows)
+            separator = b","
+    yield b"]"
+
+
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_patient(
     patient_data: PatientCreate,
     db: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
+    encryption_service: EncryptionService = Depends(get_encryption_service),
 ) -> dict[str, int]:
     """Encrypt and persist one patient record with searchable tokens."""
-    plaintext = json.dumps(patient_data.model_dump())
+    plaintext = orjson.dumps(patient_data.model_dump())
     ciphertext, iv, tag = encryption_service.encrypt_data(plaintext)
 
     patient = Patient(
@@ -59,51 +110,47 @@ async def create_patient(
 
     searchable_text = f"{patient_data.name} {patient_data.diagnosis}"
     trigrams = generate_trigrams(searchable_text)
-    hmac_tokens = [encryption_service.generate_hmac_token(trigram) for trigram in trigrams]
+    hmac_tokens = encryption_service.generate_hmac_tokens(trigrams)
 
-    db.add_all([SearchToken(patient_id=patient.id, token=token) for token in hmac_tokens])
+    if hmac_tokens:
+        await db.execute(
+            insert(SearchToken),
+            [{"patient_id": patient.id, "token": token} for token in hmac_tokens],
+        )
     await db.commit()
     return {"patient_id": patient.id}
 
 
+# Static paths must stay registered before "/{patient_id}" so they match first.
 @router.get("/search", response_model=list[PatientResponse])
 async def search_patient_records(
     query: str = Query(..., min_length=1, max_length=255),
     db: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
-) -> list[PatientResponse]:
-    """Search current user's patients by blind-index token matches."""
-    trigrams = generate_trigrams(query)
+    encryption_service: EncryptionService = Depends(get_encryption_service),
+) -> list[PatientResponse] | StreamingResponse:
+    """Search current user's patients by blind-index token matches.
+
+    Matches are streamed as a JSON array so decrypted rows are never all held
+    in memory at once and the first results go out before the last decrypt.
+    """
+    trigrams = generate_query_trigrams(query)
     if not trigrams:
         return []
 
-    hmac_tokens = [encryption_service.generate_hmac_token(trigram) for trigram in trigrams]
-    result = await db.execute(
-        select(distinct(Patient.id))
-        .join(SearchToken, SearchToken.patient_id == Patient.id)
-        .where(Patient.owner_user_id == user.id)
-        .where(SearchToken.token.in_(hmac_tokens))
-    )
-    patient_ids = [row[0] for row in result.fetchall()]
-    if not patient_ids:
-        return []
-
+    hmac_tokens = encryption_service.generate_hmac_tokens(trigrams)
     records = await db.execute(
-        select(Patient)
-        .where(Patient.owner_user_id == user.id)
-        .where(Patient.id.in_(patient_ids))
-        .order_by(Patient.id.desc())
+        _SEARCH_STMT, {"owner_user_id": user.id, "tokens": hmac_tokens}
     )
     patients = records.scalars().all()
+    if not patients:
+        return []
 
-    response: list[PatientResponse] = []
-    for patient in patients:
-        decrypted = encryption_service.decrypt_data(patient.ciphertext, patient.iv, patient.tag)
-        if not decrypted:
-            continue
-        data = json.loads(decrypted)
-        response.append(PatientResponse(id=patient.id, **data))
-    return response
+    # Rows are fetched up front: the DB session closes before the body is streamed.
+    return StreamingResponse(
+        _stream_search_results(patients, encryption_service),
+        media_type="application/json",
+    )
 
 
 @router.get("/{patient_id}", response_model=PatientResponse)
@@ -111,12 +158,11 @@ async def get_patient_record(
     patient_id: int,
     db: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user),
+    encryption_service: EncryptionService = Depends(get_encryption_service),
 ) -> PatientResponse:
     """Fetch one patient by ID for the current user and decrypt it."""
     result = await db.execute(
-        select(Patient)
-        .where(Patient.id == patient_id)
-        .where(Patient.owner_user_id == user.id)
+        _PATIENT_BY_ID_STMT, {"patient_id": patient_id, "owner_user_id": user.id}
     )
     patient = result.scalar_one_or_none()
     if not patient:
@@ -128,5 +174,6 @@ async def get_patient_record(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to decrypt patient data",
         )
-    data = json.loads(decrypted)
-    return PatientResponse(id=patient.id, **data)
+    data = orjson.loads(decrypted)
+    # Payload was validated by PatientCreate before encryption; skip re-validation.
+    return PatientResponse.model_construct(id=patient.id, **data)
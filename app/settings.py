@@ -27,7 +27,7 @@ def _normalize_database_url(url: str) -> str:
     return normalized
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Typed runtime settings used by backend modules."""
 
@@ -36,23 +36,35 @@ class Settings:
     hmac_key: str
     app_secret: str
     session_ttl_hours: int
-    cors_origins: list[str]
-    bloom_filter_size: int
-    bloom_filter_hash_count: int
+    # Also match pre-BLAKE2b (HMAC-SHA256) session hashes; see app.auth._legacy_hash_session_token.
+    accept_legacy_session_hash: bool
+    password_verify_cache_size: int
+    bcrypt_rounds: int
+    # pool_size + max_overflow, times worker processes, must stay below Postgres max_connections.
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_recycle_seconds: int
+    db_pool_timeout_seconds: int
+    cors_origins: tuple[str, ...]
 
 
 @lru_cache
 def get_settings() -> Settings:
     """Build and cache settings once per process."""
     raw_origins = os.getenv("CORS_ORIGINS", "http://localhost:5173")
-    origins = [origin.strip() for origin in raw_origins.split(",") if origin.strip()]
+    origins = tuple(origin.strip() for origin in raw_origins.split(",") if origin.strip())
     return Settings(
         database_url=_normalize_database_url(_require_env("DATABASE_URL")),
         aes_key=_require_env("AES_KEY"),
         hmac_key=_require_env("HMAC_KEY"),
         app_secret=_require_env("APP_SECRET"),
         session_ttl_hours=int(os.getenv("SESSION_TTL_HOURS", "168")),
+        accept_legacy_session_hash=os.getenv("ACCEPT_LEGACY_SESSION_HASH", "true").lower() == "true",
+        password_verify_cache_size=int(os.getenv("PASSWORD_VERIFY_CACHE_SIZE", "0")),
+        bcrypt_rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+        db_pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        db_pool_recycle_seconds=int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")),
+        db_pool_timeout_seconds=int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5")),
         cors_origins=origins,
-        bloom_filter_size=int(os.getenv("BLOOM_FILTER_SIZE", "50000")),
-        bloom_filter_hash_count=int(os.getenv("BLOOM_FILTER_HASH_COUNT", "7")),
     )
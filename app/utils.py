@@ -1,26 +1,76 @@
 """Text normalization helpers for blind-index token generation."""
 
 import re
+import string
+from functools import lru_cache
+
+_KEPT_CHARACTERS = frozenset(string.ascii_lowercase + string.digits)
+_SPACE_RUN_PATTERN = re.compile(r" {2,}")
+
+
+class _NormalizeTable(dict):
+    """`str.translate` table: keep [a-z0-9], fold whitespace to " ", drop the rest.
+
+    Values are computed per code point on lookup. Only ASCII entries are stored,
+    so client-supplied non-ASCII text cannot grow the table without bound.
+    """
+
+    def __missing__(self, codepoint: int) -> str | None:
+        char = chr(codepoint)
+        if char in _KEPT_CHARACTERS:
+            value = char
+        elif char.isspace():
+            value = " "
+        else:
+            value = None
+        if codepoint < 128:
+            self[codepoint] = value
+        return value
+
+
+_NORMALIZE_TABLE = _NormalizeTable()
+
+# Byte-level equivalent of `_NORMALIZE_TABLE` for pure-ASCII input: whitespace maps
+# to b" ", everything outside [a-z0-9] and whitespace is deleted.
+_ASCII_WHITESPACE = frozenset(code for code in range(128) if chr(code).isspace())
+_ASCII_TABLE = bytes(0x20 if code in _ASCII_WHITESPACE else code for code in range(256))
+_ASCII_DELETE = bytes(
+    code
+    for code in range(128)
+    if chr(code) not in _KEPT_CHARACTERS and code not in _ASCII_WHITESPACE
+)
 
 
 def normalize_string(text: str) -> str:
     """Normalize input before trigram extraction."""
+    # Strip on str: bytes.strip() misses whitespace such as \x1c-\x1f.
     text = text.lower().strip()
-    text = re.sub(r"[^a-z0-9\s]", "", text)
-    text = re.sub(r"\s+", " ", text)
+    if text.isascii():
+        # Common case: one C-level bytes pass, no per-character dict lookups.
+        text = text.encode("ascii").translate(_ASCII_TABLE, _ASCII_DELETE).decode("ascii")
+    else:
+        text = text.translate(_NORMALIZE_TABLE)
+    if "  " in text:
+        text = _SPACE_RUN_PATTERN.sub(" ", text)
     return text
 
 
-def generate_trigrams(text: str) -> list[str]:
-    """Generate unique 3-character windows, replacing spaces with underscores."""
-    normalized = normalize_string(text)
-    if len(normalized) < 3:
-        return []
+def generate_trigrams(text: str) -> tuple[bytes, ...]:
+    """Generate unique 3-byte ASCII windows, replacing spaces with underscores.
+
+    Trigrams are bytes so they feed HMAC without a per-token encode; a tuple is
+    returned so memoized results cannot be mutated by callers.
+    """
+    # Normalized text is pure ASCII; encode and replace spaces once up front.
+    normalized = normalize_string(text).encode("ascii").replace(b" ", b"_")
+    return tuple({normalized[i : i + 3] for i in range(len(normalized) - 2)})
+
 
-    trigrams = []
-    for i in range(len(normalized) - 2):
-        trigram = normalized[i : i + 3].replace(" ", "_")
-        if len(trigram) == 3:
-            trigrams.append(trigram)
+@lru_cache(maxsize=8192)
+def generate_query_trigrams(query: str) -> tuple[bytes, ...]:
+    """Memoized `generate_trigrams` for search query strings.
 
-    return list(set(trigrams))
+    Search queries repeat heavily and are capped at 255 characters; record text
+    on the create path is unique per patient and stays uncached.
+    """
+    return generate_trigrams(query)
@@ -0,0 +1,99 @@
+"""Authentication helper tests for password caching and session token hashing."""
+
+import hashlib
+import hmac
+
+import pytest
+from app import auth
+from app.settings import get_settings
+
+
+@pytest.fixture
+def verify_calls(monkeypatch):
+    """Enable a two-entry verify cache at bcrypt cost 4 and count real bcrypt checks."""
+    monkeypatch.setenv("BCRYPT_ROUNDS", "4")
+    monkeypatch.setenv("PASSWORD_VERIFY_CACHE_SIZE", "2")
+    get_settings.cache_clear()
+    auth._verify_cache.clear()
+
+    calls = []
+    real_verify = auth.pwd_context.verify
+
+    def counting_verify(password, password_hash):
+        calls.append(password)
+        return real_verify(password, password_hash)
+
+    monkeypatch.setattr(auth.pwd_context, "verify", counting_verify)
+    yield calls
+    auth._verify_cache.clear()
+    get_settings.cache_clear()
+
+
+def _hash(password):
+    return auth.pwd_context.using(bcrypt__rounds=get_settings().bcrypt_rounds).hash(password)
+
+
+def test_failed_verify_is_not_cached(verify_calls):
+    password_hash = _hash("correct horse")
+    assert not auth.verify_password("wrong", password_hash)
+    assert not auth.verify_password("wrong", password_hash)
+    assert len(verify_calls) == 2
+    assert not auth._verify_cache
+
+
+def test_cache_hit_skips_bcrypt(verify_calls):
+    password_hash = _hash("correct horse")
+    assert auth.verify_password("correct horse", password_hash)
+    assert auth.verify_password("correct horse", password_hash)
+    assert len(verify_calls) == 1
+
+
+def test_cache_evicts_oldest_entry(verify_calls):
+    hashes = {password: _hash(password) for password in ("one", "two", "three")}
+    for password, password_hash in hashes.items():
+        assert auth.verify_password(password, password_hash)
+    assert len(auth._verify_cache) == 2
+    assert len(verify_calls) == 3
+
+    # "three" and "two" are still cached; "one" was evicted and needs bcrypt again.
+    assert auth.verify_password("three", hashes["three"])
+    assert auth.verify_password("two", hashes["two"])
+    assert len(verify_calls) == 3
+    assert auth.verify_password("one", hashes["one"])
+    assert len(verify_calls) == 4
+
+
+def test_new_password_hash_misses_cache(verify_calls):
+    assert auth.verify_password("correct horse", _hash("correct horse"))
+    # Same password re-hashed (new salt), e.g. after a password reset.
+    assert auth.verify_password("correct horse", _hash("correct horse"))
+    assert len(verify_calls) == 2
+
+
+def test_legacy_session_hash_matches_hmac_reference():
+    """Pre-BLAKE2b sessions were stored as HMAC-SHA256 over APP_SECRET."""
+    token = "legacy-session-token"
+    expected = hmac.new(
+        get_settings().app_secret.encode("utf-8"), token.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    assert auth._legacy_hash_session_token(token) == expected
+
+
+def test_active_session_params_bind_both_digests(monkeypatch):
+    monkeypatch.setenv("ACCEPT_LEGACY_SESSION_HASH", "true")
+    get_settings.cache_clear()
+    token = auth.generate_session_token()
+    params = auth._active_session_params(token)
+    get_settings.cache_clear()
+    assert params["token_hash"] == auth.hash_session_token(token)
+    assert params["legacy_token_hash"] == auth._legacy_hash_session_token(token)
+    assert params["token_hash"] != params["legacy_token_hash"]
+
+
+def test_active_session_params_skip_legacy_digest_when_disabled(monkeypatch):
+    monkeypatch.setenv("ACCEPT_LEGACY_SESSION_HASH", "false")
+    get_settings.cache_clear()
+    token = auth.generate_session_token()
+    params = auth._active_session_params(token)
+    get_settings.cache_clear()
+    assert params["legacy_token_hash"] == params["token_hash"] == auth.hash_session_token(token)
@@ -1,6 +1,8 @@
 """Legacy encryption unit tests for service behavior."""
 
 import pytest
+import hashlib
+import hmac
 import json
 from app.encryption import EncryptionService
 from app import logger
@@ -20,8 +22,10 @@ def test_encrypt_decrypt_roundtrip(encryption_service):
     
     ciphertext, iv, tag = encryption_service.encrypt_data(plaintext_json)
     
-    # Verify outputs are base64 strings
-    assert all(len(x) > 0 for x in [ciphertext, iv, tag])
+    # Ciphertext is base64 text; IV and tag are raw bytes
+    assert len(ciphertext) > 0
+    assert len(iv) == 12
+    assert len(tag) == 16
     
     # Decrypt
     decrypted = encryption_service.decrypt_data(ciphertext, iv, tag)
@@ -37,11 +41,35 @@ def test_hmac_determinism(encryption_service):
     token3 = encryption_service.generate_hmac_token("doe")
     assert token1 != token3
 
+def test_hmac_batch_matches_single(encryption_service):
+    """Test batch HMAC tokens match per-value tokens."""
+    values = ["joh", "ohn", "hn_", "joh"]
+    expected = [encryption_service.generate_hmac_token(v) for v in values]
+    assert encryption_service.generate_hmac_tokens(values) == expected
+
+def test_hmac_matches_reference(encryption_service):
+    """Test cached HMAC state yields plain HMAC-SHA256 tokens (stored tokens stay valid)."""
+    expected = hmac.new(encryption_service.hmac_key, b"john", hashlib.sha256).hexdigest()
+    assert encryption_service.generate_hmac_token("john") == expected
+    assert encryption_service.generate_hmac_token(b"john") == expected
+
 def test_decrypt_invalid_data(encryption_service):
     """Test decryption fails with invalid data."""
     ciphertext = "invalid"
-    iv = "invalid"
-    tag = "invalid"
+    iv = b"invalid"
+    tag = b"invalid"
     
     result = encryption_service.decrypt_data(ciphertext, iv, tag)
     assert result is None
+
+def test_batch_roundtrip(encryption_service):
+    """Test batch encryption/decryption keeps input order."""
+    plaintexts = [json.dumps({"name": f"Patient {i}"}) for i in range(20)]
+
+    encrypted = encryption_service.encrypt_batch(plaintexts)
+    assert len(encrypted) == len(plaintexts)
+
+    decrypted = encryption_service.decrypt_batch(encrypted)
+    assert decrypted == plaintexts
+
+    assert encryption_service.decrypt_batch([]) == []
@@ -1,5 +1,65 @@
-"""Legacy utility tests kept as reference examples."""
+"""Utility tests pinning normalization and trigram output.
 
-# tests normalize_string(), generate_trigrams()
-def test_generate_trigrams():
-    assert generate_trigrams("john doe") == ['joh', 'ohn', 'hn_', 'n_d', '_do', 'doe']
+Stored search_tokens rows were built from these exact trigrams, so any change
+in output breaks search for existing records.
+"""
+
+import pytest
+from app.utils import generate_query_trigrams, generate_trigrams, normalize_string
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("john doe", "john doe"),
+        ("  John   Doe  ", "john doe"),
+        ("john\tdoe\n", "john doe"),
+        ("O'Brien-Smith, Jr.", "obriensmith jr"),
+        ("a . b", "a b"),
+        ("\x1cab c\x1f", "ab c"),
+        ("hypertension ", "hypertension"),
+        ("José Müller", "jos mller"),
+        ("Ñoño　über", "oo ber"),
+        # Stripping happens before removal, so a dropped leading character keeps its space.
+        (" é abc", " abc"),
+        ("!!!", ""),
+    ],
+)
+def test_normalize_string(text, expected):
+    assert normalize_string(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("john doe", {b"joh", b"ohn", b"hn_", b"n_d", b"_do", b"doe"}),
+        ("  John   Doe  ", {b"joh", b"ohn", b"hn_", b"n_d", b"_do", b"doe"}),
+        ("john\tdoe\n", {b"joh", b"ohn", b"hn_", b"n_d", b"_do", b"doe"}),
+        (
+            "O'Brien-Smith, Jr.",
+            {
+                b"obr", b"bri", b"rie", b"ien", b"ens", b"nsm",
+                b"smi", b"mit", b"ith", b"th_", b"h_j", b"_jr",
+            },
+        ),
+        ("José Müller", {b"jos", b"os_", b"s_m", b"_ml", b"mll", b"lle", b"ler"}),
+        ("Ñoño　über", {b"oo_", b"o_b", b"_be", b"ber"}),
+        ("hypertension ", {b"hyp", b"ype", b"per", b"ert", b"rte", b"ten", b"ens", b"nsi", b"sio", b"ion"}),
+        (" é abc", {b"_ab", b"abc"}),
+        ("abc!", {b"abc"}),
+        ("a b", {b"a_b"}),
+        ("ab", set()),
+        ("!!!", set()),
+    ],
+)
+def test_generate_trigrams(text, expected):
+    trigrams = generate_trigrams(text)
+    assert isinstance(trigrams, tuple)
+    assert len(trigrams) == len(expected)
+    assert set(trigrams) == expected
+
+
+def test_generate_query_trigrams_matches_uncached():
+    query = "Type 2 diabetes"
+    assert set(generate_query_trigrams(query)) == set(generate_trigrams(query))
+    assert generate_query_trigrams(query) is generate_query_trigrams(query)